@@ -4,7 +4,7 @@ This file contains Python codes for dealing with 2D discrete convolutions.
 
 import numpy as np
 from scipy.linalg import toeplitz, circulant
-from scipy.fft import fft2, ifft2
+from scipy.fft import fft2, rfft2, irfft2
 from . import check, data_structures
 
 
@@ -569,7 +569,8 @@ def product_BCCB_vector(eigenvalues, ordering, v, check_input=True):
     parameters
     ----------
     L : numpy array 2D
-        Matrix formed by the eigenvalues of the BCCB.
+        Matrix formed by the eigenvalues of a real BCCB, as computed by
+        'eigenvalues_BCCB' (or its complex conjugate).
     ordering: string
         If "row", the eigenvalues are arranged along the rows of matrix L;
         if "column", they are arranged along the columns of L.
@@ -597,7 +598,7 @@ def product_BCCB_vector(eigenvalues, ordering, v, check_input=True):
                 )
             )
 
-    # rearrange vector v into a matrix and pad with zeros
+    # rearrange vector v into a matrix
     if ordering == "row":
         # define the number of blocks and points per block of the
         # BTTB matrix associated with the BCCB matrix
@@ -605,8 +606,6 @@ def product_BCCB_vector(eigenvalues, ordering, v, check_input=True):
         npoints_per_block_BTTB = eigenvalues.shape[1] // 2
         # matrix containing the elements of vector a arranged along its rows
         V = np.reshape(v, (nblocks_BTTB, npoints_per_block_BTTB))
-        V = np.hstack([V, np.zeros((nblocks_BTTB, npoints_per_block_BTTB))])
-        V = np.vstack([V, np.zeros((nblocks_BTTB, 2 * npoints_per_block_BTTB))])
     else:  # if ordering == 'column':
         # define the number of blocks and points per block of the
         # BTTB matrix associated with the BCCB matrix
@@ -614,24 +613,29 @@ def product_BCCB_vector(eigenvalues, ordering, v, check_input=True):
         npoints_per_block_BTTB = eigenvalues.shape[0] // 2
         # matrix containing the elements of vector a arranged along its columns
         V = np.reshape(v, (nblocks_BTTB, npoints_per_block_BTTB)).T
-        V = np.hstack([V, np.zeros((npoints_per_block_BTTB, nblocks_BTTB))])
-        V = np.vstack([V, np.zeros((npoints_per_block_BTTB, 2 * nblocks_BTTB))])
+
+    # the BCCB matrix and vector v are real, so that the eigenvalues are
+    # Hermitian symmetric and only the non-redundant half of the spectrum
+    # along the last axis is required by the real-to-complex FFT.
+    # V is zero padded to the shape of the eigenvalues matrix by rfft2.
+    shape = eigenvalues.shape
+    half = shape[1] // 2 + 1
 
     # matrix obtained by computing the Hadamard product
-    H = eigenvalues * fft2(x=V, norm="ortho")
+    H = eigenvalues[:, :half] * rfft2(x=V, s=shape, norm="ortho")
 
     # matrix containing the non-null elements of the product BCCB v
     # arranged according to the parameter 'ordering'
     # the non-null elements are located in the first quadrant.
     if ordering == "row":
-        w = ifft2(x=H, norm="ortho")[
+        w = irfft2(x=H, s=shape, norm="ortho")[
             :nblocks_BTTB, :npoints_per_block_BTTB
-        ].real
+        ]
         w = w.ravel()
     else:  # if ordering == 'column':
-        w = ifft2(x=H, norm="ortho")[
+        w = irfft2(x=H, s=shape, norm="ortho")[
             :npoints_per_block_BTTB, :nblocks_BTTB
-        ].real
+        ]
         w = w.T.ravel()
 
     return w
@@ -308,14 +308,24 @@ def grid_wavenumbers(grid, pad=False, check_input=True):
     return wavenumbers
 
 
-def BTTB_transposed_metadata(BTTB_metadata, check_input=True):
+def BTTB_transposed_metadata(BTTB_metadata, copy=True, check_input=True):
     """
     Return the data structure for the transposed BTTB.
 
+    The arrays 'columns' and 'rows' of the transposed BTTB have the same
+    memory layout as those of the input and are filled along their contiguous
+    axis. For large BTTB matrices, storing these arrays in column-major
+    (Fortran) order, with the elements of each block contiguous along the
+    blocks, is preferred.
+
     parameters
     ----------
     BTTB_metadata : dictionary
         See the function 'convolve.generic_BTTB'.
+    copy : boolean
+        If False, the transposed BTTB shares the array 'columns' of the
+        input when they are equal (symmetric BTTB formed by symmetric blocks).
+        Otherwise, new arrays are always created. Default is True.
     check_input : boolean
         If True, verify if the input is valid. Default is True.
 
@@ -336,103 +346,73 @@ def BTTB_transposed_metadata(BTTB_metadata, check_input=True):
         "nblocks": BTTB_metadata["nblocks"],
     }
 
-    # get data and perform the required changes
-    if BTTB_metadata["symmetry_structure"] == "symm":
-        if BTTB_metadata["symmetry_blocks"] == "symm":
-            BTTB_T_metadata["columns"] = np.copy(BTTB_metadata["columns"])
-            BTTB_T_metadata["rows"] = None
-        elif BTTB_metadata["symmetry_blocks"] == "skew":
-            BTTB_T_metadata["columns"] = np.copy(BTTB_metadata["columns"])
-            BTTB_T_metadata["columns"][:, 1:] *= -1
-            BTTB_T_metadata["rows"] = None
-        else:  # BTTB_metadata["symmetry_blocks"] == "gene"
-            BTTB_T_metadata["columns"] = np.hstack(
-                [
-                    BTTB_metadata["columns"][:, 0][:, np.newaxis],
-                    BTTB_metadata["rows"],
-                ]
-            )
-            BTTB_T_metadata["rows"] = BTTB_metadata["columns"][:, 1:]
-
-    elif BTTB_metadata["symmetry_structure"] == "skew":
-        if BTTB_metadata["symmetry_blocks"] == "symm":
-            # get the elements forming the columns and rows
-            BTTB_T_metadata["columns"] = np.copy(BTTB_metadata["columns"])
-            BTTB_T_metadata["columns"][1:, :] *= -1
-            BTTB_T_metadata["rows"] = None
-        elif BTTB_metadata["symmetry_blocks"] == "skew":
-            # get the elements forming the columns and rows
-            BTTB_T_metadata["columns"] = np.copy(BTTB_metadata["columns"])
-            BTTB_T_metadata["columns"][:, 1:] *= -1
-            BTTB_T_metadata["columns"][1:, :] *= -1
-            BTTB_T_metadata["rows"] = None
-        else:  # BTTB_metadata["symmetry_blocks"] == "gene"
-            # get the elements forming the columns and rows
-            BTTB_T_metadata["columns"] = np.hstack(
-                [
-                    BTTB_metadata["columns"][:, 0][:, np.newaxis],
-                    BTTB_metadata["rows"],
-                ]
-            )
-            BTTB_T_metadata["rows"] = BTTB_metadata["columns"][:, 1:]
-            # change signal
-            BTTB_T_metadata["columns"][1:] *= -1
-            BTTB_T_metadata["rows"][1:] *= -1
-    else:  # BTTB_metadata["symmetry_structure"] == "gene"
-        if BTTB_metadata["symmetry_blocks"] == "symm":
-            # get the elements forming the columns and rows
-            BTTB_T_metadata["columns"] = np.copy(BTTB_metadata["columns"])
-            BTTB_T_metadata["rows"] = None
-            # get the number of blocks along a column/row
-            nblocks = BTTB_T_metadata["nblocks"]
-            # permute elements with respect to the main diagonal
-            permutation_indices = [i for i in range(2 * nblocks - 1)]
-            (permutation_indices[1:nblocks], permutation_indices[nblocks:]) = (
-                permutation_indices[nblocks:],
-                permutation_indices[1:nblocks],
-            )
-            BTTB_T_metadata["columns"] = BTTB_T_metadata["columns"][
-                permutation_indices
-            ]
-        elif BTTB_metadata["symmetry_blocks"] == "skew":
-            # get the columns
-            BTTB_T_metadata["columns"] = np.copy(BTTB_metadata["columns"])
-            BTTB_T_metadata["rows"] = None
-            # get the number of blocks along a column/row
-            nblocks = BTTB_T_metadata["nblocks"]
-            # permute the elements with respect to the main diagonal
-            permutation_indices = [i for i in range(2 * nblocks - 1)]
-            (permutation_indices[1:nblocks], permutation_indices[nblocks:]) = (
-                permutation_indices[nblocks:],
-                permutation_indices[1:nblocks],
-            )
-            BTTB_T_metadata["columns"] = BTTB_T_metadata["columns"][
-                permutation_indices
-            ]
+    columns = BTTB_metadata["columns"]
+    rows = BTTB_metadata["rows"]
+    nblocks = BTTB_metadata["nblocks"]
+
+    # define the order and signal of the blocks of the transposed BTTB
+    block_signs = np.ones((columns.shape[0], 1), dtype=int)
+    if BTTB_metadata["symmetry_structure"] == "gene":
+        # permute the blocks with respect to the main diagonal
+        block_indices = np.hstack(
+            [0, np.arange(nblocks, 2 * nblocks - 1), np.arange(1, nblocks)]
+        )
+    else:  # symmetry_structure is "symm" or "skew"
+        # keep the order of the blocks
+        block_indices = slice(None)
+        if BTTB_metadata["symmetry_structure"] == "skew":
             # change signal
-            BTTB_T_metadata["columns"][:, 1:] *= -1
-        else:  # BTTB_metadata["symmetry_blocks"] == "gene"
-            # get the elements forming the columns and rows
-            BTTB_T_metadata["columns"] = np.hstack(
-                [
-                    BTTB_metadata["columns"][:, 0][:, np.newaxis],
-                    BTTB_metadata["rows"],
-                ]
+            block_signs[1:] = -1
+
+    # create the arrays with the memory layout of the input
+    column_major = columns.flags.f_contiguous and not columns.flags.c_contiguous
+    order = "F" if column_major else "C"
+
+    # get data and perform the required changes
+    if BTTB_metadata["symmetry_blocks"] in ["symm", "skew"]:
+        if (
+            (copy is False)
+            and (BTTB_metadata["symmetry_structure"] == "symm")
+            and (BTTB_metadata["symmetry_blocks"] == "symm")
+        ):
+            # the transposed is equal to the original BTTB
+            BTTB_T_metadata["columns"] = columns
+        else:
+            BTTB_T_metadata["columns"] = np.empty(
+                columns.shape, dtype=columns.dtype, order=order
             )
-            BTTB_T_metadata["rows"] = BTTB_metadata["columns"][:, 1:]
-            # get the number of blocks along a column/row
-            nblocks = BTTB_T_metadata["nblocks"]
-            # permute the elements with respect to the main diagonal
-            permutation_indices = [i for i in range(2 * nblocks - 1)]
-            (permutation_indices[1:nblocks], permutation_indices[nblocks:]) = (
-                permutation_indices[nblocks:],
-                permutation_indices[1:nblocks],
+            np.multiply(
+                columns[block_indices],
+                block_signs,
+                out=BTTB_T_metadata["columns"],
             )
-            BTTB_T_metadata["columns"] = BTTB_T_metadata["columns"][
-                permutation_indices
-            ]
-            BTTB_T_metadata["rows"] = BTTB_T_metadata["rows"][
-                permutation_indices
-            ]
+            if BTTB_metadata["symmetry_blocks"] == "skew":
+                # change signal
+                BTTB_T_metadata["columns"][:, 1:] *= -1
+        BTTB_T_metadata["rows"] = None
+    else:  # BTTB_metadata["symmetry_blocks"] == "gene"
+        # the first columns of the transposed are formed by the first rows
+        # of the input and vice versa. New arrays are created, so that the
+        # input is not modified by the changes of signal
+        dtype = np.result_type(columns, rows)
+        BTTB_T_metadata["columns"] = np.empty(
+            columns.shape, dtype=dtype, order=order
+        )
+        BTTB_T_metadata["rows"] = np.empty(rows.shape, dtype=dtype, order=order)
+        np.multiply(
+            columns[block_indices, :1],
+            block_signs,
+            out=BTTB_T_metadata["columns"][:, :1],
+        )
+        np.multiply(
+            rows[block_indices],
+            block_signs,
+            out=BTTB_T_metadata["columns"][:, 1:],
+        )
+        np.multiply(
+            columns[block_indices, 1:],
+            block_signs,
+            out=BTTB_T_metadata["rows"],
+        )
 
     return BTTB_T_metadata
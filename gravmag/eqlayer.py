@@ -2,6 +2,8 @@ import numpy as np
 from scipy.spatial import distance
 from scipy.fft import fft2, ifft2
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit, prange, literal_unroll
 from . import inverse_distance as idist
 from . import check, utils, constants, convolve
 
@@ -272,6 +274,7 @@ def method_CGLS(
     epsilon,
     ITMAX=50,
     p0=None,
+    dtype=np.float64,
     check_input=True,
 ):
     """
@@ -292,6 +295,12 @@ def method_CGLS(
         Maximum number of iterations. Default is 50.
     p0 : numpy aray 1d or None
         If not None, it is the initial approximation for the parameter vector.
+    dtype : numpy float type
+        Precision used for storing the sensitivity matrices, np.float64 or np.float32.
+        With np.float32, the matrix-vector products read half of the bytes and
+        are computed in single precision, but the residuals, parameters and
+        norms remain in np.float64.
+        Default is np.float64.
     check_input : boolean
         If True, verify if the input is valid. Default is True.
 
@@ -329,66 +338,207 @@ def method_CGLS(
         if p0 is not None:
             check.is_array(x=p0, ndim=1, shape=(nparams,))
 
-    # get number of data for each dataset and initialize residuals list
-    ndatasets = len(data_vectors)
-    ndata_per_dataset = []
-    residuals = []
-    for data in data_vectors:
-        ndata_per_dataset.append(data.size)
-        residuals.append(np.copy(data))
-    ndata = np.sum(ndata_per_dataset)
-    nparams = sensitivity_matrices[0].shape[1]
+    # dtype is always verified because an invalid type would silently
+    # truncate the sensitivity matrices
+    if dtype not in [np.float64, np.float32]:
+        raise ValueError("dtype must be np.float64 or np.float32")
 
-    # compute the first delta and initialize the deltas list
-    deltas = []
-    delta = 0.0
-    for res in residuals:
-        delta += np.sum(res * res)
-    delta = np.sqrt(delta) / ndata
-    deltas.append(delta)
+    # get number of data for each dataset and the offsets
+    # locating each dataset in the stacked data vector
+    ndata_per_dataset = [data.size for data in data_vectors]
+    offsets = np.cumsum([0] + ndata_per_dataset)
+    ndata = offsets[-1]
+    nparams = sensitivity_matrices[0].shape[1]
 
-    # initialize the parameter vector
+    # the sensitivity matrices are not stacked, but used in their own storage
+    # order; each product with a matrix or its transpose is a single BLAS call,
+    # which handles both row- and column-major storage
+    matrices = []
+    for G in sensitivity_matrices:
+        G = G.astype(dtype, copy=False)
+        if not (G.flags.c_contiguous or G.flags.f_contiguous):
+            G = np.ascontiguousarray(G)
+        matrices.append(G)
+    matrices = tuple(matrices)
+
+    # initialize the parameter vector and the stacked residuals vector
+    residuals = np.concatenate(data_vectors).astype(float)
     if p0 is not None:
-        parameters = p0.copy()
+        parameters = p0.astype(float)
+        p0_G = parameters.astype(dtype, copy=False)
+        for G, start, stop in zip(matrices, offsets[:-1], offsets[1:]):
+            residuals[start:stop] -= G @ p0_G
     else:  # p0 is None
         parameters = np.zeros(nparams, dtype=float)
 
-    # initialize auxiliary variables
-    vartheta = np.zeros_like(parameters)
-    for G, res in zip(sensitivity_matrices, residuals):
-        vartheta[:] += G.T @ res
-    rho0 = np.sum(vartheta * vartheta)
+    # initialize auxiliary variables; the products with the matrices read
+    # eta_G and res_G and write G.T @ res_G in gtr and its sums in gtr_sum.
+    # With double precision, these are eta, residuals and vartheta, so that
+    # only gtr_sum is a work array; with single precision, all of them are
+    # work arrays in the precision of the matrices
+    vartheta = np.zeros(nparams, dtype=float)
+    eta = np.zeros(nparams, dtype=float)
+    gtr_sum = np.empty(nparams, dtype=dtype)
+    cast = dtype != np.float64
+    if cast:
+        eta_G = np.zeros(nparams, dtype=dtype)
+        res_G = np.empty(ndata, dtype=dtype)
+        gtr = gtr_sum
+    else:  # dtype == np.float64
+        eta_G = eta
+        res_G = residuals
+        gtr = vartheta
+
+    # run the compiled iterations, which update residuals and parameters;
+    # the first delta is always stored, even if ITMAX is not positive
+    deltas = np.empty(max(ITMAX, 1), dtype=float)
+    m = _cgls_iterations(
+        matrices,
+        residuals,
+        parameters,
+        vartheta,
+        eta,
+        eta_G,
+        res_G,
+        gtr,
+        gtr_sum,
+        cast,
+        epsilon,
+        ITMAX,
+        deltas,
+    )
+    deltas = deltas[:m].tolist()
+
+    return deltas, parameters
+
+
+@njit(error_model="numpy")
+def _cgls_iterations(
+    matrices,
+    residuals,
+    parameters,
+    vartheta,
+    eta,
+    eta_G,
+    res_G,
+    gtr,
+    gtr_sum,
+    cast,
+    epsilon,
+    ITMAX,
+    deltas,
+):
+    """
+    Run the CGLS iterations of 'method_CGLS' for the tuple of sensitivity
+    matrices. The residuals of all datasets are stacked in a single vector.
+    The residuals, parameters and auxiliary variables are updated in place,
+    the ratios of Euclidean norm of the residuals and number of data are
+    stored in deltas and the number of stored values is returned. Divisions
+    by zero follow NumPy and produce inf or nan instead of raising. If cast is
+    True, eta and the residuals are copied to eta_G and res_G before the
+    products with the matrices; otherwise, they are the same arrays.
+    """
+    ndata = residuals.size
+    nparams = parameters.size
+
+    # compute the first delta
+    delta = np.sqrt(_squared_norm(residuals)) / ndata
+    deltas[0] = delta
+
+    # nu stores the products of the matrices with eta_G
+    nu = np.zeros(ndata, dtype=matrices[0].dtype)
+    rho0 = _gtr_and_norm(
+        matrices, residuals, vartheta, res_G, gtr, gtr_sum, cast
+    )
     tau = 0.0
-    eta = np.zeros_like(parameters)
-    nus = []
-    for i in range(ndatasets):
-        nus.append(np.zeros_like(parameters))
     m = 1
 
     # updates
     while (delta > epsilon) and (m < ITMAX):
-        eta[:] = vartheta + tau * eta
-        aux = 0.0
-        for G, nu in zip(sensitivity_matrices, nus):
-            nu[:] = G @ eta
-            aux += np.sum(nu * nu)
-        upsilon = rho0 / aux
-        parameters[:] += upsilon * eta
-        delta = 0.0
-        for res, nu in zip(residuals, nus):
-            res[:] -= upsilon * nu
-            delta += np.sum(res * res)
-        delta = np.sqrt(delta) / ndata
-        deltas.append(delta)
-        vartheta[:] = 0.0  # remember that vartheta in an array like parameters
-        for sensitivity_matrix, res in zip(sensitivity_matrices, residuals):
-            vartheta[:] += sensitivity_matrix.T @ res
-        rho = np.sum(vartheta * vartheta)
+        for j in range(nparams):
+            eta[j] = vartheta[j] + tau * eta[j]
+        if cast:
+            for j in range(nparams):
+                eta_G[j] = eta[j]
+        start = 0
+        for G in literal_unroll(matrices):
+            stop = start + G.shape[0]
+            np.dot(G, eta_G, nu[start:stop])
+            start = stop
+        upsilon = rho0 / _squared_norm(nu)
+        for j in range(nparams):
+            parameters[j] += upsilon * eta[j]
+        delta = np.sqrt(_cgls_update_res(residuals, nu, upsilon)) / ndata
+        deltas[m] = delta
+        rho = _gtr_and_norm(
+            matrices, residuals, vartheta, res_G, gtr, gtr_sum, cast
+        )
         tau = rho / rho0
         rho0 = rho
         m += 1
 
-    return deltas, parameters
+    return m
+
+
+@njit(parallel=True, fastmath=True)
+def _squared_norm(x):
+    """
+    Squared Euclidean norm of x computed in double precision. Each element
+    is converted before being squared, so that the squares of small single
+    precision elements do not underflow.
+    """
+    result = 0.0
+    for i in prange(x.size):
+        xi = np.float64(x[i])
+        result += xi * xi
+    return result
+
+
+@njit(parallel=True, fastmath=True)
+def _cgls_update_res(res, nu, upsilon):
+    """
+    Update the residuals in place as res - upsilon * nu and return
+    the squared Euclidean norm of the updated residuals.
+    """
+    delta_sq = 0.0
+    for i in prange(res.size):
+        r = res[i] - upsilon * nu[i]
+        res[i] = r
+        delta_sq += r * r
+    return delta_sq
+
+
+@njit
+def _gtr_and_norm(matrices, res, vartheta, res_G, gtr, gtr_sum, cast):
+    """
+    Compute the sum of the products G.T @ res over the sensitivity matrices
+    in vartheta and return its squared Euclidean norm. Each product is
+    computed by BLAS, which handles G stored in row- or column-major order,
+    over the segment of res_G associated with G. The product with the first
+    matrix is written in gtr and the others in gtr_sum, which are added to
+    vartheta. If cast is True, res is copied to res_G before the products
+    and gtr is copied to vartheta; otherwise, res_G is res and gtr is
+    vartheta.
+    """
+    k = 0
+    start = 0
+    for G in literal_unroll(matrices):
+        stop = start + G.shape[0]
+        if cast:
+            for i in range(start, stop):
+                res_G[i] = res[i]
+        if k == 0:
+            np.dot(G.T, res_G[start:stop], gtr)
+            if cast:
+                for j in range(vartheta.size):
+                    vartheta[j] = gtr[j]
+        else:
+            np.dot(G.T, res_G[start:stop], gtr_sum)
+            for j in range(vartheta.size):
+                vartheta[j] += gtr_sum[j]
+        k += 1
+        start = stop
+    return _squared_norm(vartheta)
 
 
 def method_column_action_C92(
@@ -407,6 +557,9 @@ def method_column_action_C92(
     ----------
     sensitivity_matrix: numpy array 2d
         N x M matrix defined by the kernel of the equivalent layer integral.
+        The method accesses the matrix by columns. Hence, it runs faster if the
+        matrix is stored in column-major (Fortran) order. The matrix is not
+        copied, so that a row-major matrix is accessed by strided columns.
     data : numpy array 1d
         Potential-field data.
     data_points: dictionary
@@ -445,31 +598,62 @@ def method_column_action_C92(
         # check if ITMAX is a positive integer
         check.is_integer(x=ITMAX, positive=True)
 
-        # initializations
-        data_aux = sensitivity_matrix @ data
-        scale = (data_aux @ data) / (data_aux @ data_aux)
-        parameters = data * scale
-        residuals = data - sensitivity_matrix @ parameters
-        imax = np.argmax(np.abs(residuals))
-        rmax = residuals[imax]
-        rmax_list = []
+    # initializations
+    data_aux = sensitivity_matrix @ data
+    scale = (data_aux @ data) / (data_aux @ data_aux)
+    parameters = data * scale
+    # G @ parameters = scale * data_aux
+    residuals = data - scale * data_aux
+    imax, rmax = _absargmax(residuals)
+    rmax_list = []
+    rmax_list.append(abs(rmax))
+    m = 1
+    # updates
+    while (abs(rmax) > epsilon) and (m < ITMAX):
+        # dp = rmax * scale * np.abs(zlayer - data_points["z"][imax])
+        dp = rmax * scale
+        parameters[imax] += dp
+        imax, rmax = _update_res_absargmax(
+            residuals, sensitivity_matrix[:, imax], dp
+        )
         rmax_list.append(abs(rmax))
-        m = 1
-        # updates
-        while (abs(rmax) > epsilon) and (m < ITMAX):
-            xmax = data_points["x"][imax]
-            ymax = data_points["y"][imax]
-            zmax = data_points["z"][imax]
-            # dp = rmax * scale * np.abs(zlayer - zmax)
-            dp = rmax * scale
-            parameters[imax] += dp
-            residuals[:] -= sensitivity_matrix[:, imax] * dp
-            imax = np.argmax(np.abs(residuals))
-            rmax = residuals[imax]
-            rmax_list.append(abs(rmax))
-            m += 1
+        m += 1
+
+    return rmax_list, parameters
 
-        return rmax_list, parameters
+
+@njit(fastmath=True)
+def _absargmax(r):
+    """
+    Return the index and value of the element of r with maximum
+    absolute value in a single pass.
+    """
+    k = 0
+    m = -1.0
+    for i in range(r.size):
+        a = r[i] if r[i] >= 0 else -r[i]
+        if a > m:
+            m = a
+            k = i
+    return k, r[k]
+
+
+@njit(fastmath=True)
+def _update_res_absargmax(r, column, dp):
+    """
+    Update r in place as r - column * dp and return the index and value
+    of the updated element with maximum absolute value in the same pass.
+    """
+    k = 0
+    m = -1.0
+    for i in range(r.size):
+        ri = r[i] - column[i] * dp
+        r[i] = ri
+        a = ri if ri >= 0 else -ri
+        if a > m:
+            m = a
+            k = i
+    return k, r[k]
 
 
 def method_iterative_SOB17(
@@ -521,21 +705,24 @@ def method_iterative_SOB17(
     scale = (data_aux @ data) / (data_aux @ data_aux)
     if p0 is not None:
         parameters = p0.copy()
+        residuals = data - sensitivity_matrix @ parameters
     else:  # p0 is None
         parameters = data * scale
-    residuals = data - sensitivity_matrix @ parameters
+        # G @ parameters = scale * data_aux
+        residuals = data - scale * data_aux
     delta_list = []
-    delta = np.sqrt(np.sum(residuals * residuals)) / D
+    delta = np.sqrt(residuals @ residuals) / D
     delta_list.append(delta)
-    nu = np.zeros_like(parameters)
+    dp = np.zeros_like(residuals)
+    nu = np.zeros_like(residuals)
     m = 1
     # updates
     while (delta > epsilon) and (m < ITMAX):
-        dp = scale * residuals
+        np.multiply(residuals, scale, out=dp)
         parameters[:] += dp
-        nu[:] = sensitivity_matrix @ dp
+        np.dot(sensitivity_matrix, dp, out=nu)
         residuals[:] -= nu
-        delta = np.sqrt(np.sum(residuals * residuals)) / D
+        delta = np.sqrt(residuals @ residuals) / D
         delta_list.append(delta)
         m += 1
 
@@ -632,65 +819,115 @@ def method_iterative_deconvolution_TOB20(
     # total number of data
     ndata = npoints * ndatasets
 
+    # initialize the parameter vector
+    if p0 is not None:
+        parameters = p0.copy()
+    else:  # p0 is None
+        parameters = np.zeros(npoints, dtype=float)
+
+    # single data set: run the iterations without the lists of data sets
+    if ndatasets == 1:
+        L = eigenvalues_matrices[0]
+        L_T = np.conj(L)
+        res = np.copy(data_vectors[0])
+        if p0 is not None:
+            res -= convolve.product_BCCB_vector(
+                eigenvalues=L, ordering="row", v=parameters, check_input=False
+            )
+        deltas = []
+        delta = np.sqrt(res @ res) / ndata
+        deltas.append(delta)
+        vartheta = convolve.product_BCCB_vector(
+            eigenvalues=L_T, ordering="row", v=res, check_input=False
+        )
+        rho0 = vartheta @ vartheta
+        tau = 0.0
+        eta = np.zeros_like(parameters)
+        m = 1
+        while (delta > epsilon) and (m < ITMAX):
+            eta *= tau
+            eta += vartheta
+            nu = convolve.product_BCCB_vector(
+                eigenvalues=L, ordering="row", v=eta, check_input=False
+            )
+            upsilon = rho0 / (nu @ nu)
+            parameters += upsilon * eta
+            res -= upsilon * nu
+            delta = np.sqrt(res @ res) / ndata
+            deltas.append(delta)
+            vartheta = convolve.product_BCCB_vector(
+                eigenvalues=L_T, ordering="row", v=res, check_input=False
+            )
+            rho = vartheta @ vartheta
+            tau = rho / rho0
+            rho0 = rho
+            m += 1
+        return deltas, parameters
+
     # initialize residuals list
     residuals = []
-    for data in data_vectors:
-        residuals.append(np.copy(data))
+    for L, data in zip(eigenvalues_matrices, data_vectors):
+        res = np.copy(data)
+        if p0 is not None:
+            res -= convolve.product_BCCB_vector(
+                eigenvalues=L, ordering="row", v=parameters, check_input=False
+            )
+        residuals.append(res)
 
     # compute the first delta and initialize the deltas list
     deltas = []
     delta = 0.0
     for res in residuals:
-        delta += np.sum(res * res)
+        delta += res @ res
     delta = np.sqrt(delta) / ndata
     deltas.append(delta)
 
-    # initialize the parameter vector
-    if p0 is not None:
-        parameters = p0.copy()
-    else:  # p0 is None
-        parameters = np.zeros(npoints, dtype=float)
+    # compute once the eigenvalues of the transposed BCCB matrices
+    transposed_eigenvalues = [np.conj(L) for L in eigenvalues_matrices]
 
-    # initialize auxiliary variables
-    vartheta = np.zeros_like(parameters)
-    for L, res in zip(eigenvalues_matrices, residuals):
-        vartheta[:] += convolve.product_BCCB_vector(
-            eigenvalues=np.conj(L), ordering="row", v=res
+    # the BCCB products of different data sets are independent; they run on
+    # separate threads because the FFTs release the GIL
+    def product(eigenvalues, v):
+        return convolve.product_BCCB_vector(
+            eigenvalues=eigenvalues, ordering="row", v=v, check_input=False
         )
-    rho0 = np.sum(vartheta * vartheta)
-    tau = 0.0
-    eta = np.zeros_like(parameters)
-    nus = []
-    for i in range(ndatasets):
-        nus.append(np.zeros_like(parameters))
-    m = 1
 
-    # updates
-    while (delta > epsilon) and (m < ITMAX):
-        eta[:] = vartheta + tau * eta
-        aux = 0.0
-        for L, nu in zip(eigenvalues_matrices, nus):
-            nu[:] = convolve.product_BCCB_vector(
-                eigenvalues=L, ordering="row", v=eta
-            )
-            aux += np.sum(nu * nu)
-        upsilon = rho0 / aux
-        parameters[:] += upsilon * eta
-        delta = 0.0
-        for res, nu in zip(residuals, nus):
-            res[:] -= upsilon * nu
-            delta += np.sum(res * res)
-        delta = np.sqrt(delta) / ndata
-        deltas.append(delta)
-        vartheta[:] = 0.0  # remember that vartheta in an array like parameters
-        for L, res in zip(eigenvalues_matrices, residuals):
-            vartheta[:] += convolve.product_BCCB_vector(
-                eigenvalues=np.conj(L), ordering="row", v=res
+    with ThreadPoolExecutor(max_workers=ndatasets) as executor:
+        # initialize auxiliary variables
+        vartheta = np.zeros_like(parameters)
+        for w in executor.map(product, transposed_eigenvalues, residuals):
+            vartheta += w
+        rho0 = vartheta @ vartheta
+        tau = 0.0
+        eta = np.zeros_like(parameters)
+        m = 1
+
+        # updates
+        while (delta > epsilon) and (m < ITMAX):
+            eta *= tau
+            eta += vartheta
+            nus = list(
+                executor.map(product, eigenvalues_matrices, [eta] * ndatasets)
             )
-        rho = np.sum(vartheta * vartheta)
-        tau = rho / rho0
-        rho0 = rho
-        m += 1
+            aux = 0.0
+            for nu in nus:
+                aux += nu @ nu
+            upsilon = rho0 / aux
+            parameters += upsilon * eta
+            delta = 0.0
+            for res, nu in zip(residuals, nus):
+                res -= upsilon * nu
+                delta += res @ res
+            delta = np.sqrt(delta) / ndata
+            deltas.append(delta)
+            # remember that vartheta is an array like parameters
+            vartheta[:] = 0.0
+            for w in executor.map(product, transposed_eigenvalues, residuals):
+                vartheta += w
+            rho = vartheta @ vartheta
+            tau = rho / rho0
+            rho0 = rho
+            m += 1
 
     return deltas, parameters
 
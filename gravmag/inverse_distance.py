@@ -4,6 +4,7 @@ between a set of data points and a set of source points.
 """
 
 import numpy as np
+from numba import njit, prange
 from scipy.spatial import distance
 from . import check, utils
 from . import convolve as cv
@@ -36,25 +37,13 @@ def sedm(data_points, source_points, check_input=True):
         check.are_coordinates(data_points)
         check.are_coordinates(source_points)
 
-    # compute the SEDM using numpy
-    D1 = (
-        data_points["x"] * data_points["x"]
-        + data_points["y"] * data_points["y"]
-        + data_points["z"] * data_points["z"]
+    # compute the SEDM element by element, without intermediate N x M matrices
+    D = np.empty((data_points["x"].size, source_points["x"].size), dtype=float)
+    _sedm(
+        np.stack([data_points["x"], data_points["y"], data_points["z"]]),
+        np.stack([source_points["x"], source_points["y"], source_points["z"]]),
+        D,
     )
-    D2 = (
-        source_points["x"] * source_points["x"]
-        + source_points["y"] * source_points["y"]
-        + source_points["z"] * source_points["z"]
-    )
-    D3 = 2 * (
-        np.outer(data_points["x"], source_points["x"])
-        + np.outer(data_points["y"], source_points["y"])
-        + np.outer(data_points["z"], source_points["z"])
-    )
-
-    # use broadcasting rules to add D1, D2 and D3
-    D = D1[:, np.newaxis] + D2[np.newaxis, :] - D3
 
     return D
 
@@ -183,17 +172,26 @@ def grad(
                 "SEDM does not match data_points and source_points"
             )
 
-    # compute the cube of inverse distance function from the SEDM
-    R3 = SEDM * np.sqrt(SEDM)
-
     # compute the gradient components defined in components
+    # all components are computed in a single pass over the rows of the SEDM,
+    # without intermediate N x M matrices
     Ka = dict()
     Ka["header"] = (
         "1st-order partial derivative(s) of the inverse distance function computed at scattered points"
     )
     for component in components:
-        delta = data_points[component][:, np.newaxis] - source_points[component]
-        Ka[component] = -delta / R3
+        Ka[component] = np.empty(SEDM.shape, dtype=float)
+    if len(components) > 0:
+        axes = {"x": 0, "y": 1, "z": 2}
+        _grad_components(
+            np.stack([data_points["x"], data_points["y"], data_points["z"]]),
+            np.stack(
+                [source_points["x"], source_points["y"], source_points["z"]]
+            ),
+            SEDM,
+            np.array([axes[component] for component in components]),
+            tuple(Ka[component] for component in components),
+        )
 
     return Ka
 
@@ -336,32 +334,27 @@ def grad_tensor(
                 "SEDM does not match data_points and source_points"
             )
 
-    # compute the inverse distance function to the powers 3 and 5
-    R3 = SEDM * np.sqrt(SEDM)
-    R5 = R3 * SEDM
-
     # compute the gradient tensor components defined in components
+    # all components are computed in a single pass over the rows of the SEDM,
+    # without intermediate N x M matrices
     Kab = dict()
     Kab["header"] = (
         "2nd-order partial derivative(s) of the inverse distance function computed at scattered points"
     )
-    if ("xx" in components) or ("yy" in components) or ("zz" in components):
-        aux = 1 / R3  # compute this term only if it is necessary
-    else:
-        aux = 0
     for component in components:
-        delta1 = (
-            data_points[component[0]][:, np.newaxis]
-            - source_points[component[0]]
-        )
-        delta2 = (
-            data_points[component[1]][:, np.newaxis]
-            - source_points[component[1]]
+        Kab[component] = np.empty(SEDM.shape, dtype=float)
+    if len(components) > 0:
+        axes = {"x": 0, "y": 1, "z": 2}
+        _grad_tensor_components(
+            np.stack([data_points["x"], data_points["y"], data_points["z"]]),
+            np.stack(
+                [source_points["x"], source_points["y"], source_points["z"]]
+            ),
+            SEDM,
+            np.array([axes[component[0]] for component in components]),
+            np.array([axes[component[1]] for component in components]),
+            tuple(Kab[component] for component in components),
         )
-        if component in ["xx", "yy", "zz"]:
-            Kab[component] = ((3 * delta1 * delta2) / R5) - aux
-        else:
-            Kab[component] = (3 * delta1 * delta2) / R5
 
     return Kab
 
@@ -536,9 +529,13 @@ def directional_1st_order(
     Kt["header"] = (
         "1st-order directional derivative of the inverse distance function computed at scattered points"
     )
-    Kt["tx"] = t[0] * Grad["x"]
-    Kt["ty"] = t[1] * Grad["y"]
-    Kt["tz"] = t[2] * Grad["z"]
+    # scale the gradient components in place
+    Kt["tx"] = Grad["x"]
+    Kt["ty"] = Grad["y"]
+    Kt["tz"] = Grad["z"]
+    Kt["tx"] *= t[0]
+    Kt["ty"] *= t[1]
+    Kt["tz"] *= t[2]
     Kt["inclination"] = inc
     Kt["declination"] = dec
 
@@ -715,11 +712,17 @@ def directional_2nd_order(
     Ktu["header"] = (
         "2nd-order directional derivative of the inverse distance function computed at scattered points"
     )
-    Ktu["xx"] = a['xx'] * Tensor["xx"]
-    Ktu["xy"] = a['xy'] * Tensor["xy"]
-    Ktu["xz"] = a['xz'] * Tensor["xz"]
-    Ktu["yy"] = a['yy'] * Tensor["yy"]
-    Ktu["yz"] = a['yz'] * Tensor["yz"]
+    # scale the tensor components in place
+    Ktu["xx"] = Tensor["xx"]
+    Ktu["xy"] = Tensor["xy"]
+    Ktu["xz"] = Tensor["xz"]
+    Ktu["yy"] = Tensor["yy"]
+    Ktu["yz"] = Tensor["yz"]
+    Ktu["xx"] *= a['xx']
+    Ktu["xy"] *= a['xy']
+    Ktu["xz"] *= a['xz']
+    Ktu["yy"] *= a['yy']
+    Ktu["yz"] *= a['yz']
     Ktu["inclination0"] = inc0
     Ktu["declination0"] = dec0
     Ktu["inclination"] = inc
@@ -1302,3 +1305,74 @@ def _delta_zz(data_grid, delta_z, ordering):
         shape = data_grid["shape"]
 
     return symmetries, shape, delta
+
+
+@njit(parallel=True)
+def _sedm(data, sources, out):
+    """
+    Compute the squared Euclidean distances between the 3 x N and 3 x M
+    arrays of data and source coordinates and store them in the N x M
+    matrix 'out'.
+    """
+    N = data.shape[1]
+    M = sources.shape[1]
+    for i in prange(N):
+        for j in range(M):
+            dx = data[0, i] - sources[0, j]
+            dy = data[1, i] - sources[1, j]
+            dz = data[2, i] - sources[2, j]
+            out[i, j] = dx * dx + dy * dy + dz * dz
+
+
+@njit(parallel=True)
+def _grad_components(data, sources, SEDM, axes, out):
+    """
+    Compute 1st-order partial derivatives of the inverse distance function
+    and store them in the N x M matrices of the tuple 'out'. The k-th
+    derivative is computed along the axis axes[k] of the 3 x N and 3 x M
+    arrays of data and source coordinates. The term R3 of each row of the
+    SEDM is computed once and shared by all derivatives.
+    """
+    N, M = SEDM.shape
+    for i in prange(N):
+        R3 = np.empty(M)
+        for j in range(M):
+            R3[j] = SEDM[i, j] * np.sqrt(SEDM[i, j])
+        for k in range(len(out)):
+            data1 = data[axes[k], i]
+            source1 = sources[axes[k]]
+            for j in range(M):
+                out[k][i, j] = -(data1 - source1[j]) / R3[j]
+
+
+@njit(parallel=True)
+def _grad_tensor_components(data, sources, SEDM, axes1, axes2, out):
+    """
+    Compute 2nd-order partial derivatives of the inverse distance function
+    and store them in the N x M matrices of the tuple 'out'. The k-th
+    derivative is computed along the axes axes1[k] and axes2[k] of the
+    3 x N and 3 x M arrays of data and source coordinates. The terms 1/R3
+    and 3/R5 of each row of the SEDM are computed once and shared by all
+    derivatives.
+    """
+    N, M = SEDM.shape
+    for i in prange(N):
+        inv_R3 = np.empty(M)
+        three_inv_R5 = np.empty(M)
+        for j in range(M):
+            inv_R3[j] = 1 / (SEDM[i, j] * np.sqrt(SEDM[i, j]))
+            three_inv_R5[j] = 3 * inv_R3[j] / SEDM[i, j]
+        for k in range(len(out)):
+            data1 = data[axes1[k], i]
+            data2 = data[axes2[k], i]
+            source1 = sources[axes1[k]]
+            source2 = sources[axes2[k]]
+            if axes1[k] == axes2[k]:
+                for j in range(M):
+                    delta1 = data1 - source1[j]
+                    out[k][i, j] = delta1 * delta1 * three_inv_R5[j] - inv_R3[j]
+            else:
+                for j in range(M):
+                    delta1 = data1 - source1[j]
+                    delta2 = data2 - source2[j]
+                    out[k][i, j] = delta1 * delta2 * three_inv_R5[j]
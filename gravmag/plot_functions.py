@@ -4,7 +4,7 @@ using Matplotlib and PyVista.
 """
 
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection, Line3DCollection
+from matplotlib.collections import LineCollection
 import numpy as np
 from . import check
 
@@ -23,33 +23,67 @@ def plot_panels(
     mask,
     masked_shape,
     save=None,
+    style="pcolor",
 ):
     """
     Plot a regular grid of maps.
+
+    The maps are drawn with 'pcolorfast' if style is "pcolor" (default) or
+    with filled contours if style is "contour".
     """
+    if style not in ["pcolor", "contour"]:
+        raise ValueError("invalid style {}".format(style))
+
     plt.figure(figsize=size)
 
     npanels = len(Z)
 
-    for i in range(npanels):
-        plt.subplot(nrows, ncols, i + 1)
-        plt.axis("scaled")
-        plt.title(titles[i], fontsize=14)
-        plt.contourf(
-            0.001 * Y.ravel()[mask].reshape(masked_shape),
-            0.001 * X.ravel()[mask].reshape(masked_shape),
-            Z[i].ravel()[mask].reshape(masked_shape),
-            vmin=-bounds[i],
-            vmax=bounds[i],
-            cmap="seismic",
-        )
-        plt.colorbar(shrink=0.52)
-        plt.xticks(fontsize=12)
-        plt.yticks(fontsize=12)
-        plt.xlabel("y (km)", fontsize=14)
-        plt.ylabel("x (km)", fontsize=14)
-        plt.xlim(0.001 * area[2], 0.001 * area[3])
-        plt.ylim(0.001 * area[0], 0.001 * area[1])
+    # the masked coordinates (in km) are the same for all panels
+    X_km = (0.001 * X.ravel()[mask]).reshape(masked_shape)
+    Y_km = (0.001 * Y.ravel()[mask]).reshape(masked_shape)
+    # masked maps, so that the loop below only draws them
+    Z_masked = [Zi.ravel()[mask].reshape(masked_shape) for Zi in Z]
+
+    if style == "pcolor":
+        # edges of the cells centred on the first and last grid points
+        half_dx = 0.5 * (X_km[-1, 0] - X_km[0, 0]) / max(masked_shape[0] - 1, 1)
+        half_dy = 0.5 * (Y_km[0, -1] - Y_km[0, 0]) / max(masked_shape[1] - 1, 1)
+        x_edges = (X_km[0, 0] - half_dx, X_km[-1, 0] + half_dx)
+        y_edges = (Y_km[0, 0] - half_dy, Y_km[0, -1] + half_dy)
+
+    # if style is "contour", contourpy's "serial" algorithm is faster than
+    # matplotlib's default for filled contours
+    with plt.rc_context({"contour.algorithm": "serial"}):
+        for i in range(npanels):
+            plt.subplot(nrows, ncols, i + 1)
+            plt.axis("scaled")
+            plt.title(titles[i], fontsize=14)
+            if style == "pcolor":
+                # the maps are defined on regular grids
+                mappable = plt.gca().pcolorfast(
+                    y_edges,
+                    x_edges,
+                    Z_masked[i],
+                    vmin=-bounds[i],
+                    vmax=bounds[i],
+                    cmap="seismic",
+                )
+            else:  # style == "contour"
+                mappable = plt.contourf(
+                    Y_km,
+                    X_km,
+                    Z_masked[i],
+                    vmin=-bounds[i],
+                    vmax=bounds[i],
+                    cmap="seismic",
+                )
+            plt.colorbar(mappable, shrink=0.52)
+            plt.xticks(fontsize=12)
+            plt.yticks(fontsize=12)
+            plt.xlabel("y (km)", fontsize=14)
+            plt.ylabel("x (km)", fontsize=14)
+            plt.xlim(0.001 * area[2], 0.001 * area[3])
+            plt.ylim(0.001 * area[0], 0.001 * area[1])
 
     if save is not None:
         plt.savefig(save, dpi=300, facecolor="w")
@@ -68,10 +102,7 @@ def define_bound(X, Y, Z, area):
         & (Y.ravel() >= area[2])
         & (Y.ravel() <= area[3])
     )
-    Z_clipped = []
-    for Zi in Z:
-        Z_clipped.append(Zi.ravel()[mask])
-    bound = np.max(np.abs(Z_clipped))
+    bound = max(np.max(np.abs(Zi.ravel()[mask])) for Zi in Z)
     return bound
 
 
@@ -84,19 +115,12 @@ def define_mask(total, shape, clip):
     """
     xp = np.linspace(total[0], total[1], shape[0])
     yp = np.linspace(total[2], total[3], shape[1])
-    maskx = (xp.ravel() >= clip[0]) & (xp.ravel() <= clip[1])
-    masky = (yp.ravel() >= clip[2]) & (yp.ravel() <= clip[3])
-    masked_shape = (xp[maskx].size, yp[masky].size)
+    maskx = (xp >= clip[0]) & (xp <= clip[1])
+    masky = (yp >= clip[2]) & (yp <= clip[3])
+    masked_shape = (int(np.count_nonzero(maskx)), int(np.count_nonzero(masky)))
 
-    yp, xp = np.meshgrid(yp, xp)  # y-oriented grid
-    xp = np.ravel(xp)
-    yp = np.ravel(yp)
-    mask = (
-        (xp.ravel() >= clip[0])
-        & (xp.ravel() <= clip[1])
-        & (yp.ravel() >= clip[2])
-        & (yp.ravel() <= clip[3])
-    )
+    # mask on the y-oriented grid, with x varying along the rows
+    mask = np.outer(maskx, masky).ravel()
     return mask, masked_shape
 
 
@@ -105,23 +129,23 @@ def model_boundaries(model, color="k", style="--", width="2", m2km=True):
     Plot the projection of the model boundaries on plane xy.
     """
     P = check.are_rectangular_prisms(model)
-    for i in range(P):
-        x1 = model["x1"][i]
-        x2 = model["x2"][i]
-        y1 = model["y1"][i]
-        y2 = model["y2"][i]
-        x = np.array([x1, x2, x2, x1, x1])
-        y = np.array([y1, y1, y2, y2, y1])
-        if m2km is True:
-            plt.plot(
-                0.001 * y,
-                0.001 * x,
-                color=color,
-                linestyle=style,
-                linewidth=width,
-            )
-        else:
-            plt.plot(y, x, color=color, linestyle=style, linewidth=width)
+    # vertices (y, x) of the closed boundary of each prism
+    verts = np.empty((P, 5, 2))
+    verts[:, :, 0] = np.stack([model["y1"], model["y2"]], axis=1)[
+        :, [0, 0, 1, 1, 0]
+    ]
+    verts[:, :, 1] = np.stack([model["x1"], model["x2"]], axis=1)[
+        :, [0, 1, 1, 0, 0]
+    ]
+    if m2km is True:
+        verts *= 0.001
+    ax = plt.gca()
+    ax.add_collection(
+        LineCollection(
+            verts, colors=color, linestyles=style, linewidths=float(width)
+        )
+    )
+    ax.autoscale_view()
 
 
 def draw_region(
@@ -153,6 +177,123 @@ def draw_region(
     ax.set_zlabel("z (m)", fontsize=label_size)
 
 
+def prisms_to_pyvista(prisms, prop, points_out=None):
+    """
+    Create a PyVista unstructured grid formed by hexahedral cells
+    representing a set of rectangular prisms.
+
+    parameters
+    ----------
+    prisms : dictionary
+        Dictionary containing the x, y and z coordinates of the corners of each prism.
+        See function 'check.are_rectangular_prisms'.
+    prop : numpy array
+        Physical property of each prism. It is stored in the cell data
+        of the grid at the key 'prop'. A multidimensional array is
+        flattened in column-major (Fortran) order.
+    points_out : None or numpy array 2d
+        If not None, it is a C-contiguous float64 array with shape (8*P, 3),
+        where P is the number of prisms, used to store the coordinates of the
+        vertices. It allows reusing the same array in repeated calls. The
+        returned grid does not copy this array, but uses it as its points.
+        Hence, a new call with the same points_out overwrites the geometry of
+        all grids returned by previous calls with this array, which become
+        invalid. Default is None.
+
+    returns
+    -------
+    grid : pyvista.UnstructuredGrid
+        Unstructured grid representing the prisms.
+    """
+    # PyVista is required only by this function
+    import pyvista as pv
+
+    nprisms = check.are_rectangular_prisms(prisms)
+
+    if points_out is None:
+        points = np.empty((8 * nprisms, 3), dtype=np.float64)
+    else:
+        if (
+            type(points_out) != np.ndarray
+            or points_out.shape != (8 * nprisms, 3)
+            or points_out.dtype != np.float64
+            or not points_out.flags.c_contiguous
+        ):
+            raise ValueError(
+                "points_out must be a C-contiguous float64 array with shape {}".format(
+                    (8 * nprisms, 3)
+                )
+            )
+        points = points_out
+
+    # coordinates of the 8 vertices of each prism, following the VTK
+    # ordering for hexahedra (4 vertices at the top and 4 at the bottom)
+    vertices = points.reshape(nprisms, 8, 3)
+    vertices[:, [0, 3, 4, 7], 0] = prisms["x1"][:, np.newaxis]
+    vertices[:, [1, 2, 5, 6], 0] = prisms["x2"][:, np.newaxis]
+    vertices[:, [0, 1, 4, 5], 1] = prisms["y1"][:, np.newaxis]
+    vertices[:, [2, 3, 6, 7], 1] = prisms["y2"][:, np.newaxis]
+    vertices[:, :4, 2] = prisms["z1"][:, np.newaxis]
+    vertices[:, 4:, 2] = prisms["z2"][:, np.newaxis]
+
+    # each cell is defined by the number of vertices followed by their indices
+    cells = np.empty(9 * nprisms, dtype=np.int64)
+    cells_view = cells.reshape(nprisms, 9)
+    cells_view[:, 0] = 8
+    cells_view[:, 1:] = np.arange(8 * nprisms, dtype=np.int64).reshape(
+        nprisms, 8
+    )
+    celltypes = np.full(nprisms, pv.CellType.HEXAHEDRON, dtype=np.uint8)
+
+    # a 1d prop is used as it is; otherwise, ravel returns a view if possible
+    if prop.ndim > 1:
+        prop = prop.ravel(order="F")
+    check.is_array(x=prop, ndim=1, shape=(nprisms,))
+
+    grid = pv.UnstructuredGrid(cells, celltypes, points)
+    grid.cell_data["prop"] = prop
+
+    return grid
+
+
+def data_to_surface_pyvista(coordinates, data):
+    """
+    Create a PyVista surface by triangulating a set of data points.
+
+    parameters
+    ----------
+    coordinates : dictionary
+        Dictionary containing the x, y and z coordinates at the keys 'x', 'y' and 'z',
+        respectively. See function 'check.are_coordinates'.
+    data : numpy array 1d
+        Data at the points. They are stored in the point data of the surface
+        at the key 'data'.
+
+    returns
+    -------
+    surface : pyvista.PolyData
+        Surface formed by the triangulated data points.
+    """
+    # PyVista is required only by this function
+    import pyvista as pv
+
+    D = check.are_coordinates(coordinates)
+    check.is_array(x=data, ndim=1, shape=(D,))
+
+    # the points are created directly with shape (D, 3) in C order,
+    # so that PyVista does not need to copy a transposed array
+    points = np.empty((D, 3), dtype=np.float64)
+    points[:, 0] = coordinates["x"]
+    points[:, 1] = coordinates["y"]
+    points[:, 2] = coordinates["z"]
+
+    data_mesh = pv.PolyData(points)
+    data_mesh.point_data["data"] = data
+    surface = data_mesh.delaunay_2d()
+
+    return surface
+
+
 def bounds_diffs(computed, true):
     assert len(computed) == len(true)
     bounds = []
@@ -160,7 +301,7 @@ def bounds_diffs(computed, true):
     for c, t in zip(computed, true):
         bound_fields = np.max(np.abs(t))
         diffs.append(c - t)
-        bound_diff = np.max(np.abs(c - t))
+        bound_diff = np.max(np.abs(diffs[-1]))
         bounds.append(bound_fields)
         bounds.append(bound_fields)
         bounds.append(bound_diff)
@@ -170,9 +311,8 @@ def bounds_diffs(computed, true):
 
 def fields_list(computed, true, diffs):
     assert len(computed) == len(true) == len(diffs)
-    fields = []
-    for c, t, d in zip(computed, true, diffs):
-        fields.append(c)
-        fields.append(t)
-        fields.append(d)
-    return fields
\ No newline at end of file
+    fields = [None] * (3 * len(computed))
+    fields[0::3] = computed
+    fields[1::3] = true
+    fields[2::3] = diffs
+    return fields
@@ -214,6 +214,18 @@ def test_grid_wavenumbers_output_with_pad():
 # BTTB_transposed_metadata
 
 
+def assert_bttb_equal(computed, reference):
+    "compare two BTTB data structures key by key"
+    assert list(computed.keys()) == list(reference.keys())
+    for key in ["ordering", "symmetry_structure", "symmetry_blocks", "nblocks"]:
+        assert computed[key] == reference[key]
+    for key in ["columns", "rows"]:
+        if reference[key] is None:
+            assert computed[key] is None
+        else:
+            np.testing.assert_array_equal(computed[key], reference[key])
+
+
 def test_BTTB_transposed_metadata_symm_symm():
     "compare computed result with a reference for known input"
     BTTB = {
@@ -243,7 +255,7 @@ def test_BTTB_transposed_metadata_symm_symm():
         "rows": None,
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
 
 
 def test_BTTB_transposed_metadata_symm_skew():
@@ -277,7 +289,7 @@ def test_BTTB_transposed_metadata_symm_skew():
         "rows": None,
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
 
 
 def test_BTTB_transposed_metadata_symm_gene():
@@ -321,7 +333,7 @@ def test_BTTB_transposed_metadata_symm_gene():
         ),
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
 
 
 def test_BTTB_transposed_metadata_skew_symm():
@@ -355,7 +367,7 @@ def test_BTTB_transposed_metadata_skew_symm():
         "rows": None,
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
 
 
 def test_BTTB_transposed_metadata_skew_skew():
@@ -389,7 +401,7 @@ def test_BTTB_transposed_metadata_skew_skew():
         "rows": None,
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
 
 
 def test_BTTB_transposed_metadata_skew_gene():
@@ -433,7 +445,7 @@ def test_BTTB_transposed_metadata_skew_gene():
         ),
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
 
 
 def test_BTTB_transposed_metadata_gene_symm():
@@ -457,7 +469,7 @@ def test_BTTB_transposed_metadata_gene_symm():
         "rows": None,
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
 
 
 def test_BTTB_transposed_metadata_gene_skew():
@@ -481,7 +493,7 @@ def test_BTTB_transposed_metadata_gene_skew():
         "rows": None,
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
 
 
 def test_BTTB_transposed_metadata_gene_gene():
@@ -505,4 +517,73 @@ def test_BTTB_transposed_metadata_gene_gene():
         "rows": np.array([[-2, 7], [40, 50], [-90, 100]]),
     }
     computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
-    ae(computed, reference)
+    assert_bttb_equal(computed, reference)
+
+
+def test_BTTB_transposed_metadata_does_not_modify_input():
+    "the input data structure must not be modified"
+    BTTB = {
+        "ordering": "xy",
+        "symmetry_structure": "skew",
+        "symmetry_blocks": "gene",
+        "nblocks": 2,
+        "columns": np.array(
+            [
+                [0, -2, 7],
+                [10, 40, 50],
+            ]
+        ),
+        "rows": np.array(
+            [
+                [18, 32],
+                [20, 30],
+            ]
+        ),
+    }
+    columns = np.copy(BTTB["columns"])
+    rows = np.copy(BTTB["rows"])
+    ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
+    ae(BTTB["columns"], columns)
+    ae(BTTB["rows"], rows)
+
+
+def test_BTTB_transposed_metadata_column_major():
+    "column-major input must produce the same result in column-major order"
+    BTTB = {
+        "ordering": "xy",
+        "symmetry_structure": "gene",
+        "symmetry_blocks": "gene",
+        "nblocks": 2,
+        "columns": np.array([[0, -2, 7], [60, -90, 100], [10, 40, 50]]),
+        "rows": np.array([[18, 32], [70, 80], [20, 30]]),
+    }
+    BTTB_F = BTTB.copy()
+    BTTB_F["columns"] = np.asfortranarray(BTTB["columns"])
+    BTTB_F["rows"] = np.asfortranarray(BTTB["rows"])
+    reference = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
+    computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB_F)
+    assert_bttb_equal(computed, reference)
+    assert computed["columns"].flags.f_contiguous
+    assert computed["rows"].flags.f_contiguous
+
+
+def test_BTTB_transposed_metadata_copy_false():
+    "symmetric BTTB with symmetric blocks must share columns if copy is False"
+    BTTB = {
+        "ordering": "xy",
+        "symmetry_structure": "symm",
+        "symmetry_blocks": "symm",
+        "nblocks": 2,
+        "columns": np.array(
+            [
+                [1, 2, 3],
+                [10, 20, 30],
+            ]
+        ),
+        "rows": None,
+    }
+    computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB, copy=False)
+    assert computed["columns"] is BTTB["columns"]
+    computed = ds.BTTB_transposed_metadata(BTTB_metadata=BTTB)
+    assert computed["columns"] is not BTTB["columns"]
+    ae(computed["columns"], BTTB["columns"])
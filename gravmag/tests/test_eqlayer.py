@@ -3,7 +3,8 @@ from scipy.linalg import toeplitz, circulant, hankel
 from numpy.testing import assert_almost_equal as aae
 from numpy.testing import assert_equal as ae
 from pytest import raises
-from .. import eqlayer
+from .. import eqlayer, convolve
+from .. import inverse_distance as idist
 
 
 # #### kernel_matrix_monopoles
@@ -401,6 +402,182 @@ def test_method_CGLS_true_parameter_vector():
     aae(parameters, parameters_true, decimal=10)
 
 
+def test_method_CGLS_true_initial_approximation():
+    "Check if passing the true parameter vector as p0 stops the algorithm at the first iteration"
+    eps = 1e-3
+    ITMAX = 10
+    # define square matrices with order 5
+    matrices = [
+        toeplitz(np.arange(1, 6)),
+        circulant(np.linspace(3.1, 11.0, 5)),
+    ]
+    # compute data vectors with a non-null parameter vector
+    data = []
+    parameters_true = np.array([2.0, 3.1, 7.0, 1.0, 4.5])
+    for G in matrices:
+        data.append(G @ parameters_true)
+    # run the method CGLS
+    delta_list, parameters = eqlayer.method_CGLS(
+        sensitivity_matrices=matrices,
+        data_vectors=data,
+        epsilon=eps,
+        ITMAX=ITMAX,
+        p0=parameters_true,
+        check_input=True,
+    )
+    ae(len(delta_list), 1)
+    ae(parameters, parameters_true)
+
+
+def test_method_CGLS_datasets_with_different_sizes():
+    "Check if the method retrieves the true parameter vector for datasets with different sizes"
+    eps = 1e-12
+    ITMAX = 50
+    # define rectangular matrices with 5 columns and different numbers of rows
+    np.random.seed(3)
+    matrices = [
+        np.random.rand(8, 5),
+        np.random.rand(6, 5),
+    ]
+    # compute data vectors with a non-null parameter vector
+    data = []
+    parameters_true = np.array([2.0, 3.1, 7.0, 1.0, 4.5])
+    for G in matrices:
+        data.append(G @ parameters_true)
+    # run the method CGLS
+    delta_list, parameters = eqlayer.method_CGLS(
+        sensitivity_matrices=matrices,
+        data_vectors=data,
+        epsilon=eps,
+        ITMAX=ITMAX,
+        check_input=True,
+    )
+    aae(parameters, parameters_true, decimal=8)
+
+
+def test_method_CGLS_single_precision_matrices():
+    "Check if storing the matrices in single precision retrieves the true parameter vector"
+    eps = 1e-10
+    ITMAX = 50
+    # define rectangular matrices with 5 columns and different numbers of rows
+    np.random.seed(7)
+    matrices = [
+        np.random.rand(8, 5),
+        np.random.rand(6, 5),
+    ]
+    # compute data vectors with a non-null parameter vector
+    data = []
+    parameters_true = np.array([2.0, 3.1, 7.0, 1.0, 4.5])
+    for G in matrices:
+        data.append(G @ parameters_true)
+    # run the method CGLS
+    delta_list, parameters = eqlayer.method_CGLS(
+        sensitivity_matrices=matrices,
+        data_vectors=data,
+        epsilon=eps,
+        ITMAX=ITMAX,
+        dtype=np.float32,
+        check_input=True,
+    )
+    ae(parameters.dtype, np.float64)
+    aae(parameters, parameters_true, decimal=3)
+
+
+def test_method_CGLS_null_gradient():
+    "Check if data orthogonal to the columns of G produce nan instead of an error"
+    G = np.array([[1.0, 1.0], [1.0, 1.0]])
+    data = np.array([1.0, -1.0])
+    delta_list, parameters = eqlayer.method_CGLS(
+        sensitivity_matrices=[G],
+        data_vectors=[data],
+        epsilon=1e-3,
+        ITMAX=5,
+    )
+    ae(len(delta_list), 2)
+    aae(delta_list[0], np.sqrt(2) / 2, decimal=15)
+    assert np.isnan(delta_list[1])
+    assert np.all(np.isnan(parameters))
+
+
+def test_method_CGLS_null_ITMAX():
+    "Check if the first delta is returned for ITMAX=0 without checking the input"
+    G = np.array([[1.0, 1.0], [1.0, 1.0]])
+    data = np.array([1.0, 2.0])
+    delta_list, parameters = eqlayer.method_CGLS(
+        sensitivity_matrices=[G],
+        data_vectors=[data],
+        epsilon=1e-3,
+        ITMAX=0,
+        check_input=False,
+    )
+    aae(delta_list, [np.sqrt(5) / 2], decimal=15)
+    ae(parameters, np.zeros(2))
+
+
+def test_method_CGLS_single_precision_gravity_gradient():
+    "Check if single precision follows double precision for a physically scaled kernel"
+    ITMAX = 20
+    # zz component of the gravity gradient tensor produced by sources 300 m
+    # below the data points, whose elements are smaller than 1e-7
+    np.random.seed(3)
+    data_points = {
+        "x": np.random.uniform(-1000.0, 1000.0, 50),
+        "y": np.random.uniform(-1000.0, 1000.0, 50),
+        "z": np.zeros(50),
+    }
+    source_points = {
+        "x": data_points["x"].copy(),
+        "y": data_points["y"].copy(),
+        "z": np.full(50, 300.0),
+    }
+    SEDM = idist.sedm(data_points, source_points)
+    G = idist.grad_tensor(data_points, source_points, SEDM, components=["zz"])[
+        "zz"
+    ]
+    data = G @ np.linspace(1.0, 2.0, 50)
+    # run the method CGLS in double and single precision
+    deltas64, parameters64 = eqlayer.method_CGLS(
+        sensitivity_matrices=[G],
+        data_vectors=[data],
+        epsilon=1e-30,
+        ITMAX=ITMAX,
+    )
+    deltas32, parameters32 = eqlayer.method_CGLS(
+        sensitivity_matrices=[G],
+        data_vectors=[data],
+        epsilon=1e-30,
+        ITMAX=ITMAX,
+        dtype=np.float32,
+    )
+    ae(len(deltas32), ITMAX)
+    aae(parameters32, parameters64, decimal=1)
+    assert deltas32[-1] < 2 * deltas64[-1]
+
+
+def test_method_CGLS_invalid_dtype():
+    "Check if passing an invalid dtype raises an error"
+    matrices = [np.ones((4, 5)), np.ones((6, 5))]
+    data = [np.ones(4), np.ones(6)]
+    with raises(ValueError):
+        eqlayer.method_CGLS(
+            sensitivity_matrices=matrices,
+            data_vectors=data,
+            epsilon=1e-3,
+            ITMAX=10,
+            dtype=np.int64,
+            check_input=True,
+        )
+    with raises(ValueError):
+        eqlayer.method_CGLS(
+            sensitivity_matrices=matrices,
+            data_vectors=data,
+            epsilon=1e-3,
+            ITMAX=10,
+            dtype=np.int64,
+            check_input=False,
+        )
+
+
 #### method_column_action_C92
 
 
@@ -513,3 +690,140 @@ def test_method_column_action_C92_invalid_layer_depth():
             ITMAX=ITMAX,
             check_input=True,
         )
+
+
+def test_method_column_action_C92_check_input_false():
+    "Check if the method runs and gives the same result without verifying the input"
+    # define a layer of sources 100 m below a regular grid of data points
+    x, y = np.meshgrid(np.linspace(0, 1000, 6), np.linspace(0, 1000, 6))
+    coords = {
+        "x": x.ravel(),
+        "y": y.ravel(),
+        "z": np.zeros(36),
+    }
+    z_layer = 100.0
+    dx = coords["x"][:, np.newaxis] - coords["x"]
+    dy = coords["y"][:, np.newaxis] - coords["y"]
+    G = z_layer / (dx**2 + dy**2 + z_layer**2) ** 1.5
+    data = G @ np.linspace(1.0, 2.0, 36)
+    eps = 1e-8
+    ITMAX = 40
+    rmax_true, parameters_true = eqlayer.method_column_action_C92(
+        sensitivity_matrix=G,
+        data=data,
+        data_points=coords,
+        zlayer=z_layer,
+        epsilon=eps,
+        ITMAX=ITMAX,
+        check_input=True,
+    )
+    rmax_list, parameters = eqlayer.method_column_action_C92(
+        sensitivity_matrix=G,
+        data=data,
+        data_points=coords,
+        zlayer=z_layer,
+        epsilon=eps,
+        ITMAX=ITMAX,
+        check_input=False,
+    )
+    ae(rmax_list, rmax_true)
+    ae(parameters, parameters_true)
+
+
+#### method_iterative_deconvolution_TOB20
+
+
+def BTTB_point_sources(Q, P, z_layer):
+    "BTTB metadata of the kernel of point sources on a regular grid"
+    x = 100.0 * np.arange(Q)[:, np.newaxis]
+    y = 100.0 * np.arange(P)[np.newaxis, :]
+    BTTB = {
+        "ordering": "xy",
+        "symmetry_structure": "symm",
+        "symmetry_blocks": "symm",
+        "nblocks": Q,
+        "columns": z_layer / (x**2 + y**2 + z_layer**2) ** 1.5,
+        "rows": None,
+    }
+    return BTTB
+
+
+def test_method_iterative_deconvolution_TOB20_single_dataset():
+    "Check if the method recovers known parameters from a single dataset"
+    Q, P = 5, 4
+    BTTB = BTTB_point_sources(Q, P, z_layer=50.0)
+    G = convolve.BTTB_from_metadata(BTTB_metadata=BTTB)
+    L = convolve.eigenvalues_BCCB(BTTB_metadata=BTTB, ordering="row")
+    parameters_true = np.linspace(1.0, 2.0, Q * P)
+    data = G @ parameters_true
+    deltas, parameters = eqlayer.method_iterative_deconvolution_TOB20(
+        eigenvalues_matrices=[L],
+        data_vectors=[data],
+        epsilon=1e-14,
+        ITMAX=100,
+    )
+    aae(parameters, parameters_true, decimal=8)
+    # compare with the CGLS applied to the full matrix
+    deltas_CGLS, parameters_CGLS = eqlayer.method_CGLS(
+        sensitivity_matrices=[G],
+        data_vectors=[data],
+        epsilon=1e-14,
+        ITMAX=100,
+    )
+    ae(len(deltas), len(deltas_CGLS))
+    aae(deltas, deltas_CGLS, decimal=14)
+    aae(parameters, parameters_CGLS, decimal=10)
+
+
+def test_method_iterative_deconvolution_TOB20_multiple_datasets():
+    "Check if the method recovers known parameters from multiple datasets"
+    Q, P = 5, 4
+    BTTBs = [BTTB_point_sources(Q, P, z) for z in [50.0, 80.0, 120.0]]
+    matrices = [convolve.BTTB_from_metadata(BTTB_metadata=B) for B in BTTBs]
+    eigenvalues = [
+        convolve.eigenvalues_BCCB(BTTB_metadata=B, ordering="row")
+        for B in BTTBs
+    ]
+    parameters_true = np.linspace(1.0, 2.0, Q * P)
+    data = [G @ parameters_true for G in matrices]
+    deltas, parameters = eqlayer.method_iterative_deconvolution_TOB20(
+        eigenvalues_matrices=eigenvalues,
+        data_vectors=data,
+        epsilon=1e-14,
+        ITMAX=100,
+    )
+    aae(parameters, parameters_true, decimal=8)
+    # compare with the serial CGLS applied to the full matrices
+    deltas_CGLS, parameters_CGLS = eqlayer.method_CGLS(
+        sensitivity_matrices=matrices,
+        data_vectors=data,
+        epsilon=1e-14,
+        ITMAX=100,
+    )
+    ae(len(deltas), len(deltas_CGLS))
+    aae(deltas, deltas_CGLS, decimal=14)
+    aae(parameters, parameters_CGLS, decimal=10)
+
+
+def test_method_iterative_deconvolution_TOB20_true_initial_approximation():
+    "Check if passing the true parameter vector as p0 stops the algorithm at the first iteration"
+    Q, P = 5, 4
+    BTTBs = [BTTB_point_sources(Q, P, z) for z in [50.0, 80.0]]
+    matrices = [convolve.BTTB_from_metadata(BTTB_metadata=B) for B in BTTBs]
+    eigenvalues = [
+        convolve.eigenvalues_BCCB(BTTB_metadata=B, ordering="row")
+        for B in BTTBs
+    ]
+    parameters_true = np.linspace(1.0, 2.0, Q * P)
+    data = [G @ parameters_true for G in matrices]
+    # single and multiple datasets
+    for ndatasets in [1, 2]:
+        deltas, parameters = eqlayer.method_iterative_deconvolution_TOB20(
+            eigenvalues_matrices=eigenvalues[:ndatasets],
+            data_vectors=data[:ndatasets],
+            epsilon=1e-10,
+            ITMAX=10,
+            p0=parameters_true,
+        )
+        ae(len(deltas), 1)
+        ae(parameters, parameters_true)
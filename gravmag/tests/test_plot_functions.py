@@ -0,0 +1,138 @@
+import numpy as np
+from numpy.testing import assert_almost_equal as aae
+from numpy.testing import assert_equal as ae
+from pytest import raises, importorskip
+from .. import plot_functions as plf
+
+# bounds_diffs
+
+
+def test_bounds_diffs_fields_with_different_shapes():
+    "compare the bounds and differences with reference values"
+    computed = [
+        np.array([[1.0, -3.0], [2.0, 0.5]]),
+        np.array([0.0, 4.0, -1.0]),
+    ]
+    true = [
+        np.array([[1.5, -2.0], [2.0, 0.0]]),
+        np.array([0.5, 5.0, -1.0]),
+    ]
+    bounds, diffs = plf.bounds_diffs(computed, true)
+    ae(bounds, [2.0, 2.0, 1.0, 5.0, 5.0, 1.0])
+    ae(len(diffs), 2)
+    ae(diffs[0], np.array([[-0.5, -1.0], [0.0, 0.5]]))
+    ae(diffs[1], np.array([-0.5, -1.0, 0.0]))
+
+
+# prisms_to_pyvista
+
+
+def prisms_model():
+    "two rectangular prisms with different dimensions"
+    prisms = {
+        "x1": np.array([0.0, 100.0]),
+        "x2": np.array([10.0, 130.0]),
+        "y1": np.array([-20.0, 50.0]),
+        "y2": np.array([0.0, 60.0]),
+        "z1": np.array([5.0, 10.0]),
+        "z2": np.array([25.0, 50.0]),
+    }
+    return prisms
+
+
+def test_prisms_to_pyvista_known_values():
+    "compare the grid with the vertices and volumes of the prisms"
+    importorskip("pyvista")
+    prisms = prisms_model()
+    prop = np.array([1.5, -2.0])
+    grid = plf.prisms_to_pyvista(prisms, prop)
+    ae(grid.n_cells, 2)
+    ae(grid.n_points, 16)
+    # vertices of the second prism
+    reference = np.array(
+        [
+            [100.0, 50.0, 10.0],
+            [130.0, 50.0, 10.0],
+            [130.0, 60.0, 10.0],
+            [100.0, 60.0, 10.0],
+            [100.0, 50.0, 50.0],
+            [130.0, 50.0, 50.0],
+            [130.0, 60.0, 50.0],
+            [100.0, 60.0, 50.0],
+        ]
+    )
+    ae(np.asarray(grid.points)[8:], reference)
+    ae(np.asarray(grid.cell_data["prop"]), prop)
+    # the total volume is positive only if the vertices are properly ordered
+    aae(grid.volume, 10 * 20 * 20 + 30 * 10 * 40, decimal=8)
+
+
+def test_prisms_to_pyvista_prop_2d():
+    "multidimensional prop must be flattened in column-major order"
+    importorskip("pyvista")
+    prisms = prisms_model()
+    prop = np.array([[1.5], [-2.0]])
+    grid = plf.prisms_to_pyvista(prisms, prop)
+    ae(np.asarray(grid.cell_data["prop"]), prop.ravel(order="F"))
+
+
+def test_prisms_to_pyvista_points_out():
+    "the vertices must be written in points_out, which is used by the grid"
+    importorskip("pyvista")
+    prisms = prisms_model()
+    prop = np.array([1.5, -2.0])
+    reference = plf.prisms_to_pyvista(prisms, prop)
+    points_out = np.empty((16, 3))
+    grid = plf.prisms_to_pyvista(prisms, prop, points_out=points_out)
+    ae(points_out, np.asarray(reference.points))
+    assert np.shares_memory(np.asarray(grid.points), points_out)
+
+
+def test_prisms_to_pyvista_invalid_points_out():
+    "must raise ValueError for points_out with invalid shape or dtype"
+    importorskip("pyvista")
+    prisms = prisms_model()
+    prop = np.array([1.5, -2.0])
+    for points_out in [
+        np.empty((15, 3)),
+        np.empty((16, 3), dtype=np.float32),
+        np.empty((3, 16)).T,
+    ]:
+        with raises(ValueError):
+            plf.prisms_to_pyvista(prisms, prop, points_out=points_out)
+
+
+# data_to_surface_pyvista
+
+
+def test_data_to_surface_pyvista_known_values():
+    "the surface must contain the data points and the data"
+    importorskip("pyvista")
+    x, y = np.meshgrid(np.linspace(0, 100, 4), np.linspace(0, 200, 5))
+    coordinates = {
+        "x": x.ravel(),
+        "y": y.ravel(),
+        "z": np.full(20, -10.0),
+    }
+    data = np.arange(20.0)
+    surface = plf.data_to_surface_pyvista(coordinates, data)
+    ae(surface.n_points, 20)
+    # a regular grid of 3 x 4 cells is triangulated into 24 triangles
+    ae(surface.n_cells, 24)
+    points = np.asarray(surface.points)
+    ae(points[:, 0], coordinates["x"])
+    ae(points[:, 1], coordinates["y"])
+    ae(points[:, 2], coordinates["z"])
+    ae(np.asarray(surface.point_data["data"]), data)
+
+
+def test_data_to_surface_pyvista_invalid_data():
+    "must raise ValueError for data with size different from the points"
+    importorskip("pyvista")
+    coordinates = {
+        "x": np.zeros(5),
+        "y": np.arange(5.0),
+        "z": np.zeros(5),
+    }
+    with raises(ValueError):
+        plf.data_to_surface_pyvista(coordinates, np.ones(4))